@@ -1,27 +1,62 @@
 import os
 PREFIX = os.getenv("KEY_PREFIX","dev")
 import time
+import atexit
+import bisect
+import functools
+import hashlib
+import importlib.util
 import json
 import logging
+import queue
 import re
 import signal
+import threading
 import unicodedata
-from collections import deque
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from difflib import SequenceMatcher
+from operator import itemgetter
 from zoneinfo import ZoneInfo
-from typing import Deque, Dict, Set, List, Optional, Tuple
+from typing import Deque, Dict, Iterable, Iterator, Set, List, Optional, Tuple
 
 import requests
 import cloudscraper
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, Tag
 from upstash_redis import Redis
 
+try:
+    import orjson  # optional, faster JSON (de)serialization
+except ImportError:
+    orjson = None
+
+# optional, lets BeautifulSoup use libxml2's C parser
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
 
 # ---------- HTTP scraper (Cloudflare-aware) ----------
-scraper = cloudscraper.create_scraper(
-    browser={"browser": "chrome", "platform": "windows", "mobile": False}
-)
+FETCH_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (MonitoringBot; +https://github.com/you/yourbot)",
+    "Accept": "text/html,application/xhtml+xml",
+}
+
+
+def _new_scraper() -> cloudscraper.CloudScraper:
+    """Create the keep-alive scraper session used by fetch, with headers set once."""
+    s = cloudscraper.create_scraper(
+        browser={"browser": "chrome", "platform": "windows", "mobile": False}
+    )
+    s.headers.update(FETCH_HEADERS)
+    return s
+
+
+# Idle scrapers. CloudScraper keeps per-request challenge state, so each fetch
+# checks one out and never shares it with a concurrent fetch; returned scrapers
+# keep their connections alive for later cycles.
+_scraper_pool: "queue.SimpleQueue[cloudscraper.CloudScraper]" = queue.SimpleQueue()
 
 # ---------- Config via environment variables ----------
 BOT_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN")
@@ -32,6 +67,9 @@ CHECK_INTERVAL = int(os.environ.get("CHECK_INTERVAL_SECONDS", "40"))  # seconds
 LONG_INTERVAL = int(os.environ.get("LONG_CHECK_INTERVAL_SECONDS", "300"))  # 5 min default
 NO_TOPICS_THRESHOLD_SECONDS = int(os.environ.get("NO_TOPICS_THRESHOLD_SECONDS", "3600"))  # 1 hour
 
+# Max live pages fetched concurrently per cycle
+FETCH_WORKERS = int(os.environ.get("FETCH_WORKERS", "8"))
+
 # Timezone for message timestamps
 TIMEZONE = os.environ.get("TIMEZONE", "Europe/Paris")
 
@@ -44,6 +82,13 @@ DISABLE_NOTIFICATION = os.environ.get("DISABLE_NOTIFICATION", "false").lower() =
 DEDUP_SIMILARITY_THRESHOLD = float(os.environ.get("DEDUP_SIMILARITY_THRESHOLD", "0.8"))
 DEDUP_RECENT_PER_TOPIC = int(os.environ.get("DEDUP_RECENT_PER_TOPIC", "20"))
 
+# Upper bound on remembered post ids (oldest are evicted first)
+SENT_POST_IDS_MAX = int(os.environ.get("SENT_POST_IDS_MAX", "50000"))
+
+# Sent state is flushed after this many new posts or once this many seconds have passed
+SAVE_EVERY_POSTS = int(os.environ.get("SAVE_EVERY_POSTS", "16"))
+SAVE_EVERY_SECONDS = int(os.environ.get("SAVE_EVERY_SECONDS", "30"))
+
 # Debug and test modes
 DRY_RUN = os.environ.get("DRY_RUN", "false").lower() == "true"
 SELF_TEST = os.environ.get("SELF_TEST", "false").lower() == "true"
@@ -75,18 +120,110 @@ if REDIS_URL and REDIS_TOKEN:
 
 # ---------- Persistence (sent IDs and links) ----------
 SENT_FILE = "sent.json"
+
+
+def _json_dumps_bytes(obj) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # e.g. lone surrogates, which json.dumps escapes but orjson rejects
+            pass
+    return json.dumps(obj).encode("utf-8")
+
+
+def _json_loads(text: str):
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # e.g. NaN or lone surrogate escapes, which json.loads accepts
+            pass
+    return json.loads(text)
+
+
+class SeenSet:
+    """Insertion-ordered set of ids capped at ``maxlen`` entries.
+
+    Membership checks never leave the process. Ids added since the last
+    save are tracked separately so persistence only writes the new ones.
+    """
+
+    def __init__(self, items: Iterable[str] = (), maxlen: Optional[int] = None) -> None:
+        self.maxlen = maxlen if maxlen and maxlen > 0 else None
+        self._items: "OrderedDict[str, None]" = OrderedDict()
+        self._pending: Dict[str, float] = {}
+        for item in items:
+            self._store(item)
+
+    def _store(self, item: str) -> bool:
+        if item in self._items:
+            return False
+        self._items[item] = None
+        if self.maxlen is not None and len(self._items) > self.maxlen:
+            evicted, _ = self._items.popitem(last=False)
+            self._pending.pop(evicted, None)
+        return True
+
+    def add(self, item: str) -> None:
+        if self._store(item):
+            self._pending[item] = time.time()
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._pending.clear()
+
+    def pending(self) -> Dict[str, float]:
+        """Return ids added since the last ``mark_saved`` with their insert time."""
+        return dict(self._pending)
+
+    def mark_saved(self, saved: Iterable[str]) -> None:
+        for item in saved:
+            self._pending.pop(item, None)
+
+    def clear_pending(self) -> None:
+        """Forget pending ids once the full set has been persisted elsewhere."""
+        self._pending.clear()
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._items
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
 sent_links: Set[str] = set()
-sent_post_ids: Set[str] = set()  # track LiveBlogPost IDs that were sent
+sent_post_ids = SeenSet(maxlen=SENT_POST_IDS_MAX)  # track LiveBlogPost IDs that were sent
 recent_titles_by_topic: Dict[str, Deque[str]] = {}
 
+# Posts recorded since the last save and when the first of them was recorded
+_dirty_count = 0
+_dirty_since = 0.0
+
 
 def load_sent() -> None:
     """Load sent IDs and links from Redis or local file."""
     global sent_links, sent_post_ids
     if redis_client:
         try:
-            sent_links = set(redis_client.smembers(f"{PREFIX}:sent_links") or [])
-            sent_post_ids = set(redis_client.smembers(f"{PREFIX}:sent_post_ids") or [])
+            # Fetch everything in one pipeline round trip
+            pipe = redis_client.pipeline()
+            pipe.smembers(f"{PREFIX}:sent_links")
+            # ZRANGE returns oldest first, so eviction order survives restarts
+            pipe.zrange(f"{PREFIX}:sent_post_ids_z", 0, -1)
+            pipe.smembers(f"{PREFIX}:sent_post_ids")
+            links, post_ids, legacy_post_ids = pipe.exec()
+            sent_links = set(links or [])
+            if post_ids:
+                sent_post_ids = SeenSet(post_ids, maxlen=SENT_POST_IDS_MAX)
+            else:
+                # migrate ids stored by older versions as a plain set
+                sent_post_ids = SeenSet(maxlen=SENT_POST_IDS_MAX)
+                for pid in legacy_post_ids or []:
+                    sent_post_ids.add(pid)
             logging.info(
                 f"Loaded {len(sent_links)} links and {len(sent_post_ids)} post_ids from Redis"
             )
@@ -96,10 +233,10 @@ def load_sent() -> None:
     if os.path.isfile(SENT_FILE):
         try:
             with open(SENT_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
+                data = _json_loads(f.read())
             if isinstance(data, dict):
                 sent_links = set(data.get("links", []))
-                sent_post_ids = set(data.get("post_ids", []))
+                sent_post_ids = SeenSet(data.get("post_ids", []), maxlen=SENT_POST_IDS_MAX)
             elif isinstance(data, list):
                 # legacy format (only links)
                 sent_links = set(data)
@@ -111,60 +248,113 @@ def load_sent() -> None:
 
 
 def save_sent() -> None:
-    """Persist sent IDs and links to Redis and local file."""
+    """Persist sent IDs and links to Redis and local file.
+
+    Post ids go to a ZSET scored by insertion time; only ids added since the
+    last save are written and the set is trimmed to SENT_POST_IDS_MAX.
+    """
     try:
         if redis_client:
             try:
-                # Use two calls for broader compatibility
-                redis_client.delete(f"{PREFIX}:sent_links")
-                redis_client.delete(f"{PREFIX}:sent_post_ids")
+                # One MULTI/EXEC round trip instead of one request per command
+                pipe = redis_client.multi()
+                pipe.delete(f"{PREFIX}:sent_links")
                 if sent_links:
-                    redis_client.sadd(f"{PREFIX}:sent_links", *sent_links)
-                if sent_post_ids:
-                    redis_client.sadd(f"{PREFIX}:sent_post_ids", *sent_post_ids)
+                    pipe.sadd(f"{PREFIX}:sent_links", *sent_links)
+                pending = sent_post_ids.pending()
+                if pending:
+                    pipe.zadd(f"{PREFIX}:sent_post_ids_z", pending)
+                    if SENT_POST_IDS_MAX > 0:
+                        pipe.zremrangebyrank(
+                            f"{PREFIX}:sent_post_ids_z", 0, -SENT_POST_IDS_MAX - 1
+                        )
+                pipe.exec()
+                sent_post_ids.mark_saved(pending)
             except Exception as e:
                 logging.warning(f"Could not save to Redis: {e}")
-        with open(SENT_FILE, "w", encoding="utf-8") as f:
-            json.dump({"links": list(sent_links), "post_ids": list(sent_post_ids)}, f)
+        # Write to a temp file and rename so a crash mid-write never truncates SENT_FILE
+        tmp = SENT_FILE + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_json_dumps_bytes({"links": list(sent_links), "post_ids": list(sent_post_ids)}))
+        os.replace(tmp, SENT_FILE)
+        if not redis_client:
+            # The file holds every id, so nothing is left to write incrementally
+            sent_post_ids.clear_pending()
     except Exception as e:
         logging.warning(f"Could not save {SENT_FILE}: {e}")
 
 
+def _mark_dirty(count: int = 1) -> None:
+    """Record that count posts were added to the sent state since the last save."""
+    global _dirty_count, _dirty_since
+    if not _dirty_count:
+        _dirty_since = time.monotonic()
+    _dirty_count += count
+
+
+def _maybe_flush(force: bool = False) -> None:
+    """Call save_sent once enough posts or time have accumulated (or if forced)."""
+    global _dirty_count
+    if not _dirty_count:
+        return
+    if (
+        force
+        or _dirty_count >= SAVE_EVERY_POSTS
+        or time.monotonic() - _dirty_since >= SAVE_EVERY_SECONDS
+    ):
+        save_sent()
+        _dirty_count = 0
+
+
+def _flush_remaining() -> Optional[float]:
+    """Seconds until buffered sent state is due to be saved, or None if nothing is buffered."""
+    if not _dirty_count:
+        return None
+    return max(0.0, SAVE_EVERY_SECONDS - (time.monotonic() - _dirty_since))
+
+
 # ---------- HTTP helper with retries ----------
 
 def fetch(url: str, timeout: int = 15, retries: int = 3, backoff: int = 3) -> str:
-    headers = {
-        "User-Agent": "Mozilla/5.0 (MonitoringBot; +https://github.com/you/yourbot)",
-        "Accept": "text/html,application/xhtml+xml",
-    }
-    global scraper
-    for attempt in range(1, retries + 1):
-        try:
-            resp = scraper.get(url, headers=headers, timeout=timeout)
-            if resp.status_code == 403:
-                logging.warning(
-                    f"403 for {url} attempt {attempt} - recreating scraper"
-                )
-                scraper = cloudscraper.create_scraper(
-                    browser={"browser": "chrome", "platform": "windows", "mobile": False}
-                )
+    try:
+        scraper = _scraper_pool.get_nowait()
+    except queue.Empty:
+        scraper = _new_scraper()
+    try:
+        for attempt in range(1, retries + 1):
+            try:
+                resp = scraper.get(url, timeout=timeout)
+                if resp.status_code == 403:
+                    logging.warning(
+                        f"403 for {url} attempt {attempt} - recreating scraper"
+                    )
+                    scraper = _new_scraper()
+                    if attempt == retries:
+                        resp.raise_for_status()
+                    else:
+                        time.sleep(backoff * attempt)
+                        continue
+                resp.raise_for_status()
+                return resp.text
+            except Exception as e:
+                logging.warning(f"Fetch error {url} attempt {attempt}: {e}")
                 if attempt == retries:
-                    resp.raise_for_status()
-                else:
-                    time.sleep(backoff * attempt)
-                    continue
-            resp.raise_for_status()
-            return resp.text
-        except Exception as e:
-            logging.warning(f"Fetch error {url} attempt {attempt}: {e}")
-            if attempt == retries:
-                raise
-            time.sleep(backoff * attempt)
-    return ""
+                    raise
+                time.sleep(backoff * attempt)
+        return ""
+    finally:
+        _scraper_pool.put(scraper)
 
 
 # ---------- Live topics and posts parsing ----------
 
+# (digest of the last parsed homepage, topics found in it)
+_topics_cache: Tuple[bytes, Dict[str, str]] = (b"", {})
+
+# Nav label that precedes live topic links, e.g. "Live:"
+LIVE_LABEL_RE = re.compile(r"live:", re.I)
+
+
 def get_live_topics(html: Optional[str] = None) -> Dict[str, str]:
     """Return dict topic_name -> full_url for each live topic in nav.
 
@@ -172,14 +362,21 @@ def get_live_topics(html: Optional[str] = None) -> Dict[str, str]:
       1. Find any text containing 'live:' and look for following anchor.
       2. Also scan anchors whose text starts with 'LIVE:'.
     If html is provided, parse it instead of fetching the homepage.
+    The homepage rarely changes between polls, so the result for an
+    identical body is reused instead of parsing it again.
     """
+    global _topics_cache
     if html is None:
         html = fetch(HOMEPAGE_URL)
-    soup = BeautifulSoup(html, "html.parser")
+    digest = hashlib.blake2b(html.encode("utf-8"), digest_size=16).digest()
+    if digest == _topics_cache[0]:
+        return dict(_topics_cache[1])
+
+    soup = BeautifulSoup(html, HTML_PARSER)
     topics: Dict[str, str] = {}
 
     # Approach 1: text node containing 'live:'
-    for text_node in soup.find_all(string=lambda t: t and "live:" in t.lower()):
+    for text_node in soup.find_all(string=LIVE_LABEL_RE):
         parent = text_node.parent
         a = parent.find_next("a")
         if a and a.get("href"):
@@ -191,16 +388,17 @@ def get_live_topics(html: Optional[str] = None) -> Dict[str, str]:
                 topics[name] = url
 
     # Approach 2: anchors that include leading LIVE:
-    for a in soup.find_all("a"):
+    for a in soup.find_all("a", href=True):
         txt = a.get_text(" ", strip=True)
-        if txt.lower().startswith("live:") and a.get("href"):
-            name = txt.replace("LIVE:", "").replace("Live:", "").strip()
+        if txt[:5].lower() == "live:" and a.get("href"):
+            name = txt[5:].strip()
             url = a["href"]
             if url.startswith("/"):
                 url = HOMEPAGE_URL + url
             if name and name not in topics:
                 topics[name] = url
 
+    _topics_cache = (digest, dict(topics))
     return topics
 
 
@@ -208,8 +406,18 @@ def normalize_url(href: str) -> str:
     return href if href.startswith("http") else HOMEPAGE_URL + href
 
 
+def _url_fragment(link: str) -> Optional[str]:
+    """Return the text after the last '#' in link, or None if there is none."""
+    i = link.rfind("#")
+    if i < 0 or i == len(link) - 1:
+        return None
+    return link[i + 1:]
+
+
 # --- Permalink resolution helpers ---
 GUID_LIKE_RE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.I)
+LIVEPOST_HEADLINE_CLASS_RE = re.compile(r"LiveBlogPost-headline", re.I)
+HEADLINE_CLASS_RE = re.compile(r"headline|title", re.I)
 
 
 
@@ -218,8 +426,8 @@ def _norm_text(s: str) -> str:
         return ""
     s = unicodedata.normalize("NFKC", s)
     s = s.replace("\u2019", "'")  # curly apostrophe to straight
-    s = re.sub(r"\s+", " ", s).strip().lower()
-    return s
+    # split()/join collapses whitespace like re.sub(r"\s+", " ", s).strip(), without the regex
+    return " ".join(s.split()).lower()
 
 
 def _get_recent_titles(topic: str) -> Deque[str]:
@@ -239,11 +447,23 @@ def remember_recent_post(topic: str, title: str) -> None:
     dq.append(normalized)
 
 
+@functools.lru_cache(maxsize=512)
+def _title_matcher(previous: str) -> SequenceMatcher:
+    """SequenceMatcher with a recent title as its second sequence.
+
+    SequenceMatcher precomputes its index over the second sequence, so
+    caching one per recent title avoids rebuilding it for every candidate.
+    """
+    matcher = SequenceMatcher(None)
+    matcher.set_seq2(previous)
+    return matcher
+
+
 def check_recent_post_similarity(topic: str, title: str) -> Tuple[bool, float]:
     """Check if the title is similar to a recently sent post for the topic.
 
-    Uses a simple SequenceMatcher ratio (0..1). Returns a tuple of
-    (is_similar, similarity_score).
+    Uses a simple SequenceMatcher ratio (0..1), pruned with its cheaper
+    upper bounds. Returns a tuple of (is_similar, similarity_score).
     """
     normalized = _norm_text(title)
     if not normalized:
@@ -251,24 +471,32 @@ def check_recent_post_similarity(topic: str, title: str) -> Tuple[bool, float]:
 
     dq = _get_recent_titles(topic)
     for previous in dq:
-        ratio = SequenceMatcher(None, normalized, previous).ratio()
+        matcher = _title_matcher(previous)
+        matcher.set_seq1(normalized)
+        # Both quick ratios are upper bounds of ratio(); skip the expensive
+        # matching when even the bound cannot reach the threshold
+        if matcher.real_quick_ratio() < DEDUP_SIMILARITY_THRESHOLD:
+            continue
+        if matcher.quick_ratio() < DEDUP_SIMILARITY_THRESHOLD:
+            continue
+        ratio = matcher.ratio()
         if ratio >= DEDUP_SIMILARITY_THRESHOLD:
             return True, ratio
     return False, 0.0
 
 
 # --- AP live blog helpers ---
-def _build_livepost_index(soup: BeautifulSoup) -> Dict[str, str]:
+def _build_livepost_index(live_posts: List[Tag]) -> Dict[str, str]:
     """Map normalized headline text -> fragment id for <bsp-liveblog-post> blocks.
     Uses each post's data-post-id and its visible <h2 class="LiveBlogPost-headline"> text.
     """
     index: Dict[str, str] = {}
-    for post in soup.find_all("bsp-liveblog-post"):
+    for post in live_posts:
         pid = (post.get("data-post-id") or "").strip()
         if not pid:
             continue
         # headline lives here on AP live blogs
-        h = post.find("h2", class_=re.compile(r"LiveBlogPost-headline", re.I)) or post.find(["h1", "h2", "h3"]) 
+        h = post.find("h2", class_=LIVEPOST_HEADLINE_CLASS_RE) or post.find(["h1", "h2", "h3"]) 
         heading = h.get_text(" ", strip=True) if h else ""
         key = _norm_text(heading)
         if key and pid and key not in index:
@@ -276,44 +504,57 @@ def _build_livepost_index(soup: BeautifulSoup) -> Dict[str, str]:
     return index
 
 
-def _find_livepost_id_by_time(soup: BeautifulSoup, ts_iso: str) -> Optional[str]:
-    """Find the <bsp-liveblog-post> whose data-posted-date-timestamp is closest to ts_iso.
-    Accepts if within 12 hours.
+def _build_livepost_ts_index(live_posts: List[Tag]) -> List[Tuple[int, str]]:
+    """Collect (data-posted-date-timestamp ms, data-post-id) for <bsp-liveblog-post> blocks.
+    The result is sorted by timestamp so lookups can bisect it.
     """
-    try:
-        target = datetime.fromisoformat(ts_iso.replace("Z", "+00:00"))
-    except Exception:
-        return None
-
-    closest: Tuple[float, Optional[str]] = (float("inf"), None)
-    for post in soup.find_all("bsp-liveblog-post"):
+    index: List[Tuple[int, str]] = []
+    for post in live_posts:
         pid = (post.get("data-post-id") or "").strip()
         ts_ms = post.get("data-posted-date-timestamp")
         if not pid or not ts_ms:
             continue
         try:
-            dt_val = datetime.fromtimestamp(int(ts_ms) / 1000, tz=timezone.utc)
-        except Exception:
+            index.append((int(ts_ms), pid))
+        except ValueError:
             continue
-        diff = abs((dt_val - target).total_seconds())
+    index.sort()
+    return index
+
+
+def _find_livepost_id_by_time(livepost_ts_idx: List[Tuple[int, str]], ts_iso: str) -> Optional[str]:
+    """Find the live post whose timestamp is closest to ts_iso.
+    livepost_ts_idx must be sorted by timestamp. Accepts if within 12 hours.
+    """
+    try:
+        target = datetime.fromisoformat(ts_iso.replace("Z", "+00:00"))
+    except Exception:
+        return None
+
+    target_ms = target.timestamp() * 1000
+    # Only the neighbours around the insertion point can be closest
+    i = bisect.bisect_left(livepost_ts_idx, (target_ms,))
+    closest: Tuple[float, Optional[str]] = (float("inf"), None)
+    for ts_ms, pid in livepost_ts_idx[max(0, i - 1):i + 1]:
+        diff = abs(ts_ms - target_ms) / 1000
         if diff < closest[0]:
             closest = (diff, pid)
     return closest[1] if closest[0] <= 12 * 3600 else None
 
 
 
-def _build_article_index(soup: BeautifulSoup) -> Dict[str, str]:
+def _build_article_index(live_posts: List[Tag], articles: List[Tag]) -> Dict[str, str]:
     """Map normalized heading text -> article/post id.
     Supports both traditional <article id> blocks and AP's <bsp-liveblog-post> blocks.
     """
     index: Dict[str, str] = {}
 
     # 1) AP live blog posts
-    for post in soup.find_all("bsp-liveblog-post"):
+    for post in live_posts:
         pid = (post.get("data-post-id") or "").strip()
         if not pid:
             continue
-        h = post.find("h2", class_=re.compile(r"LiveBlogPost-headline", re.I)) or post.find(["h1", "h2", "h3"]) 
+        h = post.find("h2", class_=LIVEPOST_HEADLINE_CLASS_RE) or post.find(["h1", "h2", "h3"]) 
         if not h:
             continue
         heading = h.get_text(" ", strip=True)
@@ -322,13 +563,13 @@ def _build_article_index(soup: BeautifulSoup) -> Dict[str, str]:
             index[key] = pid
 
     # 2) Generic <article id="..."> fallback
-    for art in soup.find_all("article"):
+    for art in articles:
         aid = (art.get("id") or "").strip()
         if not aid:
             continue
         if not GUID_LIKE_RE.match(aid) and len(aid.split("-")) != 5:
             continue
-        h = art.find(["h1", "h2", "h3"]) or art.find(class_=re.compile(r"headline|title", re.I))
+        h = art.find(["h1", "h2", "h3"]) or art.find(class_=HEADLINE_CLASS_RE)
         if not h:
             continue
         heading = h.get_text(" ", strip=True)
@@ -340,7 +581,30 @@ def _build_article_index(soup: BeautifulSoup) -> Dict[str, str]:
 
 
 
-def _find_article_id_by_time(soup: BeautifulSoup, ts_iso: str) -> Optional[str]:
+def _build_article_time_index(soup: BeautifulSoup) -> List[Tuple[datetime, str]]:
+    """Collect (datetime, article id) for <time> elements inside GUID-like <article> blocks."""
+    index: List[Tuple[datetime, str]] = []
+    for t in soup.find_all("time"):
+        dt_attr = t.get("datetime") or t.get("data-datetime")
+        if not dt_attr:
+            continue
+        try:
+            dt_val = datetime.fromisoformat(dt_attr.replace("Z", "+00:00"))
+        except Exception:
+            continue
+        art = t.find_parent("article")
+        aid = (art.get("id") if art else None) or None
+        if not aid:
+            continue
+        if not GUID_LIKE_RE.match(aid) and len(aid.split("-")) != 5:
+            continue
+        index.append((dt_val, aid))
+    return index
+
+
+def _find_article_id_by_time(livepost_ts_idx: List[Tuple[int, str]],
+                             article_ts_idx: List[Tuple[datetime, str]],
+                             ts_iso: str) -> Optional[str]:
     """Heuristic: try AP <bsp-liveblog-post> timestamps first, then generic <time>.
     Returns a GUID-like id or None.
     """
@@ -350,33 +614,22 @@ def _find_article_id_by_time(soup: BeautifulSoup, ts_iso: str) -> Optional[str]:
         return None
 
     # A) AP live blog posts
-    best_live = _find_livepost_id_by_time(soup, ts_iso)
+    best_live = _find_livepost_id_by_time(livepost_ts_idx, ts_iso)
     if best_live:
         return best_live
 
     # B) Generic <time> under <article>
     closest: Tuple[float, Optional[str]] = (float("inf"), None)
-    for t in soup.find_all("time"):
-        dt_attr = t.get("datetime") or t.get("data-datetime")
-        if not dt_attr:
-            continue
-        try:
-            dt_val = datetime.fromisoformat(dt_attr.replace("Z", "+00:00"))
-        except Exception:
-            continue
+    for dt_val, aid in article_ts_idx:
         diff = abs((dt_val - target).total_seconds())
-        art = t.find_parent("article")
-        aid = (art.get("id") if art else None) or None
-        if not aid:
-            continue
-        if not GUID_LIKE_RE.match(aid) and len(aid.split("-")) != 5:
-            continue
         if diff < closest[0]:
             closest = (diff, aid)
     return closest[1] if closest[0] <= 12 * 3600 else None
 
 
-def resolve_post_permalink(soup: BeautifulSoup,
+def resolve_post_permalink(article_idx: Dict[str, str],
+                           livepost_ts_idx: List[Tuple[int, str]],
+                           article_ts_idx: List[Tuple[datetime, str]],
                            live_url: str,
                            copy_links: Dict[str, str],
                            post_id: Optional[str],
@@ -384,6 +637,7 @@ def resolve_post_permalink(soup: BeautifulSoup,
                            title: str,
                            ts_iso: str) -> str:
     """Return the best permalink for a post with a fragment that matches UI copy-link.
+    The indexes are built once per page by parse_live_page.
     Preference order:
       0) If JSON-LD post_url already contains a #fragment, trust it
       1) Exact match via bsp-copy-link mapping (by id or its fragment)
@@ -408,14 +662,13 @@ def resolve_post_permalink(soup: BeautifulSoup,
             return copy_links[post_id]
 
     # 2) match by heading text (AP live blog <bsp-liveblog-post>)
-    idx = _build_article_index(soup)  # now supports both live posts and <article>
     key = _norm_text(title)
-    if key and key in idx:
-        frag = idx[key]
+    if key and key in article_idx:
+        frag = article_idx[key]
         return f"{live_url}#{frag}"
 
     # 3) match by nearest timestamp (prefers <bsp-liveblog-post> timestamps)
-    aid = _find_article_id_by_time(soup, ts_iso)
+    aid = _find_article_id_by_time(livepost_ts_idx, article_ts_idx, ts_iso)
     if aid:
         return f"{live_url}#{aid}"
 
@@ -435,75 +688,30 @@ def resolve_post_permalink(soup: BeautifulSoup,
     return live_url
 
 
-def parse_live_page(topic_name: str, url: str, html: Optional[str] = None) -> List[Tuple[str, str, str, str]]:
-    """Scrape via the JSON-LD <script type="application/ld+json"> of type LiveBlogPosting.
-
-    It extracts a list of tuples: (post_id, title, permalink, ts_iso).
-    If html is provided, parse it instead of fetching from the url.
-    """
-    if html is None:
-        html = fetch(url)
-    soup = BeautifulSoup(html, "html.parser")
-
-    # Map post id -> full share/permalink from multiple sources
-    copy_links: Dict[str, str] = {}
+# <script type="application/ld+json"> payloads, matched on the raw HTML
+LD_JSON_SCRIPT_RE = re.compile(
+    r"<script\b[^>]*(?<![\w-])type\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script\s*>",
+    re.I | re.S,
+)
+# Commented-out markup, which an HTML parser never treats as a script
+HTML_COMMENT_RE = re.compile(r"<!--.*?-->", re.S)
 
-    # 1) <bsp-copy-link data-link="...#fragment">
-    for cl in soup.find_all("bsp-copy-link"):
-        data_link = cl.get("data-link")
-        if not data_link:
-            continue
-        # normalize to absolute and extract fragment
-        full_link = normalize_url(data_link) if not data_link.startswith("#") else f"{url}{data_link}"
-        m = re.search(r"#([^#]+)$", full_link)
-        if m:
-            copy_links[m.group(1)] = full_link
-        # also map the parent article id if available
-        parent = cl.find_parent("article")
-        if parent and parent.get("id"):
-            copy_links[parent["id"]] = full_link
 
-    # 2) Any element with data-clipboard-text that looks like a URL with a #fragment
-    for el in soup.find_all(attrs={"data-clipboard-text": True}):
-        raw = (el.get("data-clipboard-text") or "").strip()
-        if not raw or "#" not in raw:
-            continue
-        full_link = normalize_url(raw) if not raw.startswith("#") else f"{url}{raw}"
-        m = re.search(r"#([^#]+)$", full_link)
-        if m:
-            copy_links[m.group(1)] = full_link
+def _find_liveblog_ld(html: str) -> Optional[dict]:
+    """Return the LiveBlogPosting JSON-LD entry, including inside @graph arrays.
 
-    # 3) <a href="...#fragment"> anywhere on the page (including inside articles)
-    for a in soup.find_all("a", href=True):
-        href = a["href"].strip()
-        if "#" not in href:
-            continue
-        full_link = normalize_url(href) if not href.startswith("#") else f"{url}{href}"
-        m = re.search(r"#([^#]+)$", full_link)
-        if m:
-            copy_links[m.group(1)] = full_link
-
-    # 4) Seed known id values from both <bsp-liveblog-post> and <article>
-    for post in soup.find_all("bsp-liveblog-post"):
-        pid = (post.get("data-post-id") or "").strip()
-        if pid:
-            copy_links.setdefault(pid, f"{url}#{pid}")
-    for art in soup.find_all("article"):
-        aid = (art.get("id") or "").strip()
-        if not aid:
-            continue
-        if not GUID_LIKE_RE.match(aid) and len(aid.split("-")) != 5:
-            continue
-        copy_links.setdefault(aid, f"{url}#{aid}")
-
-    # Find the JSON-LD block for the live blog, including inside @graph arrays
+    Scripts are sliced out of the raw HTML with a regex, so pages without
+    a live blog never need a DOM. Scripts inside HTML comments are ignored.
+    """
     ld_json = None
-    for script in soup.find_all("script", {"type": "application/ld+json"}):
+    if "<!--" in html:
+        html = HTML_COMMENT_RE.sub("", html)
+    for m in LD_JSON_SCRIPT_RE.finditer(html):
         try:
-            raw_text = script.get_text(strip=True)
+            raw_text = m.group(1).strip()
             if not raw_text:
                 continue
-            raw = json.loads(raw_text)
+            raw = _json_loads(raw_text)
         except Exception:
             continue
         # If raw is a dict and has @graph, search inside it
@@ -537,6 +745,20 @@ def parse_live_page(topic_name: str, url: str, html: Optional[str] = None) -> Li
         if ld_json:
             break
 
+    return ld_json
+
+
+def parse_live_page(topic_name: str, url: str, html: Optional[str] = None) -> List[Tuple[str, str, str, str]]:
+    """Scrape via the JSON-LD <script type="application/ld+json"> of type LiveBlogPosting.
+
+    It extracts a list of tuples: (post_id, title, permalink, ts_iso).
+    If html is provided, parse it instead of fetching from the url.
+    """
+    if html is None:
+        html = fetch(url)
+
+    # Locate the updates first; the DOM is only built when there are posts to resolve
+    ld_json = _find_liveblog_ld(html)
     if not ld_json:
         logging.warning(f"No LiveBlogPosting JSON-LD found for {topic_name}")
         return []
@@ -564,38 +786,135 @@ def parse_live_page(topic_name: str, url: str, html: Optional[str] = None) -> Li
         )
         return []
 
-    new_items: List[Tuple[str, str, str, str]] = []
+    # Only posts that were not sent yet need a permalink, which needs the DOM
+    unsent: List[Tuple[str, dict]] = []
     for post in posts:
         pid = (
             post.get("@id")
             or post.get("url")
             or f"{post.get('headline')}_{post.get('datePublished', post.get('dateModified', ''))}"
         )
+        if pid and pid not in sent_post_ids:
+            unsent.append((str(pid), post))
+    if not unsent:
+        return []
+
+    soup = BeautifulSoup(html, HTML_PARSER)
+    # Walk the tree once for the post containers used by several lookups below
+    live_posts = soup.find_all("bsp-liveblog-post")
+    articles = soup.find_all("article")
+
+    # Map post id -> full share/permalink from multiple sources
+    copy_links: Dict[str, str] = {}
+
+    # 1) <bsp-copy-link data-link="...#fragment">
+    for cl in soup.find_all("bsp-copy-link"):
+        data_link = cl.get("data-link")
+        if not data_link:
+            continue
+        # normalize to absolute and extract fragment
+        full_link = normalize_url(data_link) if not data_link.startswith("#") else f"{url}{data_link}"
+        frag = _url_fragment(full_link)
+        if frag:
+            copy_links[frag] = full_link
+        # also map the parent article id if available
+        parent = cl.find_parent("article")
+        if parent and parent.get("id"):
+            copy_links[parent["id"]] = full_link
+
+    # 2) Any element with data-clipboard-text that looks like a URL with a #fragment
+    for el in soup.find_all(attrs={"data-clipboard-text": True}):
+        raw = (el.get("data-clipboard-text") or "").strip()
+        if not raw or "#" not in raw:
+            continue
+        full_link = normalize_url(raw) if not raw.startswith("#") else f"{url}{raw}"
+        frag = _url_fragment(full_link)
+        if frag:
+            copy_links[frag] = full_link
+
+    # 3) <a href="...#fragment"> anywhere on the page (including inside articles)
+    for a in soup.find_all("a", href=True):
+        href = a["href"].strip()
+        if "#" not in href:
+            continue
+        full_link = normalize_url(href) if not href.startswith("#") else f"{url}{href}"
+        frag = _url_fragment(full_link)
+        if frag:
+            copy_links[frag] = full_link
+
+    # 4) Seed known id values from both <bsp-liveblog-post> and <article>
+    for post in live_posts:
+        pid = (post.get("data-post-id") or "").strip()
+        if pid:
+            copy_links.setdefault(pid, f"{url}#{pid}")
+    for art in articles:
+        aid = (art.get("id") or "").strip()
+        if not aid:
+            continue
+        if not GUID_LIKE_RE.match(aid) and len(aid.split("-")) != 5:
+            continue
+        copy_links.setdefault(aid, f"{url}#{aid}")
+
+    # DOM lookups used to resolve permalinks, built once for all posts
+    article_idx = _build_article_index(live_posts, articles)
+    livepost_ts_idx = _build_livepost_ts_index(live_posts)
+    article_ts_idx = _build_article_time_index(soup)
+
+    new_items: List[Tuple[str, str, str, str]] = []
+    for pid, post in unsent:
         title = post.get("headline", "").strip() or post.get("name", "").strip()
         ts_iso = post.get("datePublished") or post.get("dateModified") or datetime.now(timezone.utc).isoformat()
         post_url = post.get("url") or post.get("mainEntityOfPage")
 
         # Resolve the most accurate permalink with a correct fragment
         permalink = resolve_post_permalink(
-            soup=soup,
+            article_idx=article_idx,
+            livepost_ts_idx=livepost_ts_idx,
+            article_ts_idx=article_ts_idx,
             live_url=url,
             copy_links=copy_links,
-            post_id=str(pid) if pid else None,
+            post_id=pid,
             post_url=post_url,
             title=title,
             ts_iso=ts_iso,
         )
+        new_items.append((pid, title, permalink, ts_iso))
 
-        if pid and pid not in sent_post_ids:
-            new_items.append((str(pid), title, permalink, ts_iso))
-
-    # Sort oldest -> newest by timestamp
-    new_items.sort(key=lambda t: t[3] or "")
+    # Sort oldest -> newest by timestamp (ts_iso is never empty, ISO strings sort lexically)
+    new_items.sort(key=itemgetter(3))
     return new_items
 
 
 # ---------- Telegram send ----------
 
+# Telegram rejects messages over 4096 chars; keep some headroom
+TELEGRAM_MAX_MESSAGE_LEN = 4000
+BATCH_SEPARATOR = "\n\n——\n\n"
+
+# Shared session so consecutive sends reuse the TLS connection to api.telegram.org.
+# sendMessage is not idempotent: only retry when Telegram cannot have delivered
+# the message (connection not established, or 429 rate limit). Read errors and
+# 5xx may come after delivery, so they are never retried.
+_tg_session = requests.Session()
+_tg_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=2,
+            connect=2,
+            read=0,
+            other=0,
+            backoff_factor=0.3,
+            status_forcelist=[429],
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False,  # hand the last response back for logging
+        ),
+    ),
+)
+
+
 def _telegram_api_send(text: str, parse_mode: str = "") -> requests.Response:
     api_url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
     params = {
@@ -608,7 +927,7 @@ def _telegram_api_send(text: str, parse_mode: str = "") -> requests.Response:
         params["disable_web_page_preview"] = True
     if DISABLE_NOTIFICATION:
         params["disable_notification"] = True
-    return requests.post(api_url, data=params, timeout=15)
+    return _tg_session.post(api_url, data=params, timeout=15)
 
 
 def send_telegram_message(text: str) -> None:
@@ -618,8 +937,8 @@ def send_telegram_message(text: str) -> None:
     If a 400 occurs with a parse mode, retry once without parse mode.
     """
     # Truncate if necessary to avoid hitting Telegram 4096 char limit
-    if len(text) > 4000:
-        text = text[:4000] + "\n…"
+    if len(text) > TELEGRAM_MAX_MESSAGE_LEN:
+        text = text[:TELEGRAM_MAX_MESSAGE_LEN] + "\n…"
 
     if DRY_RUN:
         logging.info(f"[DRY_RUN] Would send to Telegram:\n{text}")
@@ -649,6 +968,25 @@ def send_telegram_message(text: str) -> None:
         logging.warning(f"Telegram exception: {e}")
 
 
+def send_telegram_batch(messages: List[str]) -> None:
+    """Send several messages using as few Telegram requests as possible.
+
+    Consecutive messages are joined with BATCH_SEPARATOR while the combined
+    text fits in TELEGRAM_MAX_MESSAGE_LEN. A message that is too long on its
+    own is sent by itself (and truncated by send_telegram_message).
+    """
+    batch = ""
+    for msg in messages:
+        if batch and len(batch) + len(BATCH_SEPARATOR) + len(msg) <= TELEGRAM_MAX_MESSAGE_LEN:
+            batch += BATCH_SEPARATOR + msg
+            continue
+        if batch:
+            send_telegram_message(batch)
+        batch = msg
+    if batch:
+        send_telegram_message(batch)
+
+
 def format_message(topic: str, title: str, url: str, ts_iso: str) -> str:
     """Format a post into a Telegram-friendly message."""
     # Parse the ISO timestamp and convert to configured timezone
@@ -662,8 +1000,12 @@ def format_message(topic: str, title: str, url: str, ts_iso: str) -> str:
         date_str = ts_iso  # fallback to raw timestamp
         tz_abbr = TIMEZONE
 
-    # Clean any HTML tags in the title
-    clean_title = BeautifulSoup(title or "", "html.parser").get_text()
+    # Clean any HTML tags and entities in the title; most titles have neither
+    title = title or ""
+    if "<" in title or "&" in title:
+        clean_title = BeautifulSoup(title, "html.parser").get_text()
+    else:
+        clean_title = title
 
     # Build the message (use plain text friendly formatting)
     lines = [
@@ -689,11 +1031,21 @@ def calculate_delay(current_interval: float, elapsed: float) -> float:
 
 # ---------- Graceful shutdown ----------
 
+# Set on SIGINT/SIGTERM; the main loop waits on it so shutdown is immediate
+_stop_event = threading.Event()
+
+
 def _install_signal_handlers() -> None:
     def _handle(sig, frame):
-        logging.info(f"Signal {sig} received - saving state and exiting")
+        if _stop_event.is_set():
+            # Second signal: do not wait for the current cycle to finish
+            logging.info(f"Signal {sig} received again - saving state and exiting")
+            save_sent()
+            raise SystemExit(0)
+        # Persist right away so a kill after the grace period loses nothing
+        logging.info(f"Signal {sig} received - saving state and stopping after the current cycle")
         save_sent()
-        raise SystemExit(0)
+        _stop_event.set()
 
     for s in (signal.SIGINT, signal.SIGTERM):
         try:
@@ -864,23 +1216,24 @@ def main() -> None:
         logging.warning(f"Startup notification failed: {e}")
 
     current_interval = CHECK_INTERVAL
-    last_topics_seen_at = time.time()
+    last_topics_seen_at = time.monotonic()
     logging.info(f"Initial scan interval: {current_interval}s")
 
+    # Scheduled start of the current cycle on the monotonic clock
+    cycle_start = time.monotonic()
     while True:
-        loop_start = time.time()
         try:
             topics = get_live_topics()
 
             # Adaptive interval logic
             if topics:
-                last_topics_seen_at = time.time()
+                last_topics_seen_at = time.monotonic()
                 if current_interval != CHECK_INTERVAL:
                     logging.info("LIVE topics returned - reverting interval")
                     current_interval = CHECK_INTERVAL
             else:
                 if (
-                    time.time() - last_topics_seen_at
+                    time.monotonic() - last_topics_seen_at
                 ) > NO_TOPICS_THRESHOLD_SECONDS and current_interval != LONG_INTERVAL:
                     logging.info("No LIVE topics for 1 hour - switching interval to 5 minutes")
                     current_interval = LONG_INTERVAL
@@ -888,10 +1241,23 @@ def main() -> None:
             if not topics:
                 logging.info("No live topics this cycle")
 
-            for topic_name, topic_url in topics.items():
-                logging.info(f"Checking {topic_name} -> {topic_url}")
-                new_posts = parse_live_page(topic_name, topic_url)
+            # Fetch live pages concurrently; posts are still handled serially in topic order
+            futures = {}
+            if topics:
+                with ThreadPoolExecutor(max_workers=max(1, min(FETCH_WORKERS, len(topics)))) as ex:
+                    for topic_name, topic_url in topics.items():
+                        logging.info(f"Checking {topic_name} -> {topic_url}")
+                        futures[topic_name] = ex.submit(parse_live_page, topic_name, topic_url)
+
+            for topic_name, future in futures.items():
+                try:
+                    new_posts = future.result()
+                except Exception as e:
+                    logging.warning(f"Could not check {topic_name}: {e}")
+                    continue
 
+                messages: List[str] = []
+                titles: List[str] = []
                 for pid, title, link, ts_iso in new_posts:
                     if pid in sent_post_ids:
                         continue
@@ -905,23 +1271,46 @@ def main() -> None:
                             DEDUP_SIMILARITY_THRESHOLD * 100,
                         )
                         continue
-                    msg = format_message(topic_name, title, link, ts_iso)
-                    send_telegram_message(msg)
+                    messages.append(format_message(topic_name, title, link, ts_iso))
+                    titles.append(title)
                     sent_post_ids.add(pid)
                     sent_links.add(link)
                     remember_recent_post(topic_name, title)
-                    save_sent()
-                    logging.info(f"Sent: {title}")
+
+                if messages:
+                    send_telegram_batch(messages)
+                    _mark_dirty(len(messages))
+                    for title in titles:
+                        logging.info(f"Sent: {title}")
 
         except Exception as e:
             logging.error(f"Cycle error: {e}")
 
-        elapsed = time.time() - loop_start
+        _maybe_flush()
+
+        elapsed = time.monotonic() - cycle_start
         # Sleep only for the remaining time left in the interval. If the loop
         # took longer than the interval, start the next iteration immediately
-        # instead of adding extra delay.
-        time.sleep(calculate_delay(current_interval, elapsed))
+        # instead of adding extra delay. A stop signal ends the wait early.
+        delay = calculate_delay(current_interval, elapsed)
+        flush_in = _flush_remaining()
+        if flush_in is not None and flush_in < delay:
+            # Save buffered ids when they are due instead of holding them through the wait
+            if _stop_event.wait(flush_in):
+                break
+            _maybe_flush(force=True)
+            delay -= flush_in
+        if _stop_event.wait(delay):
+            break
+        # Anchor the next cycle to its deadline rather than to when the wait
+        # returned, so wake-up jitter does not accumulate into drift
+        cycle_start = cycle_start + current_interval if delay else time.monotonic()
+
+    _maybe_flush(force=True)
+    logging.info("Bot stopped")
 
 
 if __name__ == "__main__":
+    # Do not lose buffered sent state on any other kind of exit
+    atexit.register(_maybe_flush, force=True)
     main()
@@ -10,6 +10,12 @@ LOCK_TTL    = int(os.getenv("LEADER_LOCK_TTL", "45"))
 RENEW_EVERY = int(os.getenv("LEADER_LOCK_RENEW", "15"))
 _running = True
 
+# Extend the TTL only if we still own the lock, in one atomic round trip
+RENEW_SCRIPT = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then "
+    "return redis.call('expire', KEYS[1], ARGV[2]) else return 0 end"
+)
+
 def _stop(*_):
     global _running
     _running = False
@@ -33,9 +39,7 @@ def run_with_lock(loop_once):
             while _running:
                 now = time.time()
                 if now - last >= RENEW_EVERY:
-                    if r.get(LOCK_KEY) == pid:
-                        r.expire(LOCK_KEY, LOCK_TTL)
-                    else:
+                    if not r.eval(RENEW_SCRIPT, [LOCK_KEY], [pid, str(LOCK_TTL)]):
                         log.info("Lost leader lock; re-acquiring…")
                         break
                     last = now
@@ -47,3 +47,13 @@ def test_format_message_strips_html():
     expected = f"{expected_title}\n\n📰 Topic - {expected_date} CET\n\nhttps://example.com"
     assert msg == expected
 
+
+
+def test_format_message_decodes_entities():
+    msg = apnewslivebot.format_message(
+        "Topic",
+        "Tom &amp; Jerry",
+        "https://example.com",
+        "2024-01-01T00:00:00Z",
+    )
+    assert msg.startswith("Tom & Jerry\n")
@@ -50,3 +50,15 @@ def test_format_message_plain():
         "https://example.com/a"
     )
     assert msg == expected
+
+
+def test_get_live_topics_reuses_result_for_same_html(monkeypatch):
+    apnewslivebot.get_live_topics(HOMEPAGE_HTML)
+
+    def fail_parse(*args, **kwargs):
+        raise AssertionError("homepage parsed again")
+
+    monkeypatch.setattr(apnewslivebot, "BeautifulSoup", fail_parse)
+    topics = apnewslivebot.get_live_topics(HOMEPAGE_HTML)
+
+    assert "Topic One" in topics
@@ -20,23 +20,20 @@ def test_main_skips_duplicate_links(monkeypatch):
     def mock_send(msg):
         messages.append(msg)
 
-    def stop_sleep(seconds):
-        raise SystemExit
+    def stop_wait(timeout=None):
+        return True
 
     monkeypatch.setattr(apnewslivebot, "get_live_topics", mock_get_live_topics)
     monkeypatch.setattr(apnewslivebot, "parse_live_page", mock_parse_live_page)
     monkeypatch.setattr(apnewslivebot, "send_telegram_message", mock_send)
-    monkeypatch.setattr(apnewslivebot.time, "sleep", stop_sleep)
+    monkeypatch.setattr(apnewslivebot._stop_event, "wait", stop_wait)
     monkeypatch.setattr(apnewslivebot, "save_sent", lambda: None)
 
     apnewslivebot.sent_links.clear()
     apnewslivebot.sent_post_ids.clear()
     apnewslivebot.recent_titles_by_topic.clear()
 
-    try:
-        apnewslivebot.main()
-    except SystemExit:
-        pass
+    apnewslivebot.main()
 
     # first message is the start notification
     assert len(messages) == 3
@@ -59,3 +56,148 @@ def test_check_recent_post_similarity_threshold():
     )
     assert not is_similar2
     assert ratio2 < apnewslivebot.DEDUP_SIMILARITY_THRESHOLD
+
+
+def test_send_telegram_batch_packs_messages(monkeypatch):
+    sent = []
+    monkeypatch.setattr(apnewslivebot, "send_telegram_message", sent.append)
+
+    long_msg = "x" * (apnewslivebot.TELEGRAM_MAX_MESSAGE_LEN - 10)
+    apnewslivebot.send_telegram_batch(["one", "two", long_msg, "three"])
+
+    assert sent == [
+        f"one{apnewslivebot.BATCH_SEPARATOR}two",
+        long_msg,
+        "three",
+    ]
+
+
+def test_maybe_flush_waits_for_enough_posts(monkeypatch):
+    saves = []
+    monkeypatch.setattr(apnewslivebot, "save_sent", lambda: saves.append(1))
+    apnewslivebot._maybe_flush(force=True)  # drain anything left by other tests
+    saves.clear()
+
+    apnewslivebot._mark_dirty(1)
+    apnewslivebot._maybe_flush()
+    assert saves == []
+
+    apnewslivebot._mark_dirty(apnewslivebot.SAVE_EVERY_POSTS)
+    apnewslivebot._maybe_flush()
+    assert saves == [1]
+
+
+def test_main_continues_when_one_topic_fails(monkeypatch):
+    messages = []
+
+    def mock_parse_live_page(topic_name, url):
+        if topic_name == "A":
+            raise RuntimeError("boom")
+        return [("b-1", "Only B", "https://example.com/b", "2024-01-01T00:00:00Z")]
+
+    monkeypatch.setattr(apnewslivebot, "get_live_topics", lambda: {"A": "urlA", "B": "urlB"})
+    monkeypatch.setattr(apnewslivebot, "parse_live_page", mock_parse_live_page)
+    monkeypatch.setattr(apnewslivebot, "send_telegram_message", messages.append)
+    monkeypatch.setattr(apnewslivebot._stop_event, "wait", lambda timeout=None: True)
+    monkeypatch.setattr(apnewslivebot, "save_sent", lambda: None)
+
+    apnewslivebot.sent_post_ids.clear()
+    apnewslivebot.recent_titles_by_topic.clear()
+
+    apnewslivebot.main()
+
+    assert any("https://example.com/b" in m for m in messages)
+
+
+def test_telegram_session_never_resends_after_read_or_5xx():
+    retry = apnewslivebot._tg_session.get_adapter("https://api.telegram.org").max_retries
+
+    assert retry.read == 0
+    assert retry.other == 0
+    assert set(retry.status_forcelist) == {429}
+    assert not retry.is_retry("POST", 500)
+    assert not retry.is_retry("POST", 503)
+    assert retry.is_retry("POST", 429)
+
+
+def test_first_signal_saves_state_and_sets_stop_event(monkeypatch):
+    saves = []
+    handlers = {}
+    monkeypatch.setattr(apnewslivebot, "save_sent", lambda: saves.append(1))
+    monkeypatch.setattr(apnewslivebot.signal, "signal", lambda sig, h: handlers.setdefault(sig, h))
+    monkeypatch.setattr(apnewslivebot, "_stop_event", apnewslivebot.threading.Event())
+
+    apnewslivebot._install_signal_handlers()
+    handlers[apnewslivebot.signal.SIGTERM](apnewslivebot.signal.SIGTERM, None)
+
+    assert saves == [1]
+    assert apnewslivebot._stop_event.is_set()
+
+
+def test_main_flushes_during_idle_wait_when_due(monkeypatch):
+    saves = []
+    waits = []
+
+    def record_wait(timeout=None):
+        waits.append((timeout, len(saves)))
+        return len(waits) > 1  # stop on the second wait
+
+    monkeypatch.setattr(apnewslivebot, "get_live_topics", lambda: {"A": "urlA"})
+    monkeypatch.setattr(
+        apnewslivebot,
+        "parse_live_page",
+        lambda name, url: [("a-1", "Post A", "https://example.com/a", "2024-01-01T00:00:00Z")],
+    )
+    monkeypatch.setattr(apnewslivebot, "send_telegram_message", lambda msg: None)
+    monkeypatch.setattr(apnewslivebot._stop_event, "wait", record_wait)
+    monkeypatch.setattr(apnewslivebot, "save_sent", lambda: saves.append(1))
+    monkeypatch.setattr(apnewslivebot, "SAVE_EVERY_SECONDS", 5)
+
+    apnewslivebot.sent_post_ids.clear()
+    apnewslivebot.recent_titles_by_topic.clear()
+
+    apnewslivebot.main()
+
+    # the first wait ends at the flush deadline, not after the full interval
+    assert 0 < waits[0][0] <= 5
+    assert waits[0][1] == 0
+    # buffered ids were saved before waiting out the rest of the interval
+    assert waits[1][1] == 1
+
+
+def test_fetch_never_shares_a_scraper_between_concurrent_calls(monkeypatch):
+    import threading
+    import time as _time
+
+    in_use = set()
+    overlaps = []
+    lock = threading.Lock()
+
+    class FakeResponse:
+        status_code = 200
+        text = "ok"
+
+        def raise_for_status(self):
+            pass
+
+    class FakeScraper:
+        def get(self, url, timeout=None):
+            with lock:
+                if id(self) in in_use:
+                    overlaps.append(url)
+                in_use.add(id(self))
+            _time.sleep(0.02)
+            with lock:
+                in_use.discard(id(self))
+            return FakeResponse()
+
+    monkeypatch.setattr(apnewslivebot, "_new_scraper", FakeScraper)
+    monkeypatch.setattr(apnewslivebot, "_scraper_pool", apnewslivebot.queue.SimpleQueue())
+
+    with apnewslivebot.ThreadPoolExecutor(max_workers=4) as ex:
+        results = list(ex.map(apnewslivebot.fetch, [f"u{i}" for i in range(8)]))
+
+    assert results == ["ok"] * 8
+    assert overlaps == []
+    # scrapers are returned for reuse, at most one per concurrent fetch
+    assert 0 < apnewslivebot._scraper_pool.qsize() <= 4
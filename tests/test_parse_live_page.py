@@ -205,3 +205,61 @@ def test_parse_live_page_copy_links_relative(monkeypatch):
     posts = apnewslivebot.parse_live_page("topic", "https://example.com/live")
     assert len(posts) == 3
     assert posts[0][2] == "https://apnews.com/live#p1"
+
+
+def test_find_livepost_id_by_time_nearest():
+    idx = [(1_000, "a"), (5_000, "b"), (9_000, "c")]
+
+    assert apnewslivebot._find_livepost_id_by_time(idx, "1970-01-01T00:00:03.500Z") == "b"
+    assert apnewslivebot._find_livepost_id_by_time(idx, "1970-01-01T00:00:08Z") == "c"
+    # more than 12 hours away from every post
+    assert apnewslivebot._find_livepost_id_by_time(idx, "1970-01-02T00:00:00Z") is None
+
+
+def test_parse_live_page_skips_dom_when_nothing_new(monkeypatch):
+    def fail_parse(*args, **kwargs):
+        raise AssertionError("DOM built although every post was already sent")
+
+    monkeypatch.setattr(apnewslivebot, "BeautifulSoup", fail_parse)
+    apnewslivebot.sent_post_ids.clear()
+    for pid in ("p0", "p1", "p2", "p3"):
+        apnewslivebot.sent_post_ids.add(pid)
+
+    posts = apnewslivebot.parse_live_page("topic", "https://example.com/live", html=COPY_SNIPPET)
+    apnewslivebot.sent_post_ids.clear()
+
+    assert posts == []
+
+
+def test_find_liveblog_ld_requires_real_type_attribute():
+    payload = json.dumps(LD_JSON)
+
+    assert apnewslivebot._find_liveblog_ld(
+        f'<script data-type="application/ld+json">{payload}</script>'
+    ) is None
+    assert apnewslivebot._find_liveblog_ld(
+        f'<script data-type="x" type="application/ld+json">{payload}</script>'
+    ) is not None
+
+
+def test_find_liveblog_ld_ignores_commented_out_scripts():
+    stale = json.dumps({**LD_JSON, "headline": "Stale"})
+    live = json.dumps(LD_JSON)
+    html = (
+        f'<!-- <script type="application/ld+json">{stale}</script> -->'
+        f'<script type="application/ld+json">{live}</script>'
+    )
+
+    ld = apnewslivebot._find_liveblog_ld(html)
+
+    assert ld is not None
+    assert ld.get("headline") != "Stale"
+
+
+def test_find_liveblog_ld_accepts_json_orjson_rejects():
+    payload = json.dumps({**LD_JSON, "ratio": float("nan")})
+
+    ld = apnewslivebot._find_liveblog_ld(f'<script type="application/ld+json">{payload}</script>')
+
+    assert ld is not None
+    assert ld["@type"] == "LiveBlogPosting"
@@ -0,0 +1,116 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "test")
+os.environ.setdefault("TELEGRAM_CHANNEL_ID", "test")
+
+import apnewslivebot
+
+
+def test_seen_set_evicts_oldest():
+    seen = apnewslivebot.SeenSet(["a", "b"], maxlen=3)
+    seen.add("c")
+    seen.add("d")
+
+    assert "a" not in seen
+    assert list(seen) == ["b", "c", "d"]
+    assert len(seen) == 3
+
+
+def test_seen_set_tracks_pending_until_saved():
+    seen = apnewslivebot.SeenSet(["a"], maxlen=10)
+    seen.add("b")
+    seen.add("a")  # already known, not pending
+
+    pending = seen.pending()
+    assert list(pending) == ["b"]
+
+    seen.mark_saved(pending)
+    assert seen.pending() == {}
+    assert "b" in seen
+
+
+def test_save_and_load_sent_roundtrip(monkeypatch, tmp_path):
+    path = tmp_path / "sent.json"
+    monkeypatch.setattr(apnewslivebot, "SENT_FILE", str(path))
+    monkeypatch.setattr(apnewslivebot, "redis_client", None)
+    monkeypatch.setattr(apnewslivebot, "sent_links", {"https://example.com/a"})
+    monkeypatch.setattr(apnewslivebot, "sent_post_ids", apnewslivebot.SeenSet(["p1", "p2"]))
+
+    apnewslivebot.sent_post_ids.add("p3")
+    apnewslivebot.save_sent()
+    assert not (tmp_path / "sent.json.tmp").exists()
+    # without Redis the file holds every id, so nothing stays pending
+    assert apnewslivebot.sent_post_ids.pending() == {}
+
+    apnewslivebot.sent_links = set()
+    apnewslivebot.sent_post_ids = apnewslivebot.SeenSet()
+    apnewslivebot.load_sent()
+
+    assert apnewslivebot.sent_links == {"https://example.com/a"}
+    assert list(apnewslivebot.sent_post_ids) == ["p1", "p2", "p3"]
+
+
+class FakePipeline:
+    def __init__(self, log):
+        self.log = log
+
+    def __getattr__(self, name):
+        def command(*args):
+            self.log.append((name, args))
+            return self
+        return command
+
+
+class FakeRedis:
+    def __init__(self):
+        self.log = []
+
+    def multi(self):
+        return FakePipeline(self.log)
+
+
+def test_save_sent_pipelines_new_post_ids(monkeypatch, tmp_path):
+    fake = FakeRedis()
+    seen = apnewslivebot.SeenSet(["old"])
+    seen.add("new")
+    monkeypatch.setattr(apnewslivebot, "SENT_FILE", str(tmp_path / "sent.json"))
+    monkeypatch.setattr(apnewslivebot, "redis_client", fake)
+    monkeypatch.setattr(apnewslivebot, "sent_links", {"https://example.com/a"})
+    monkeypatch.setattr(apnewslivebot, "sent_post_ids", seen)
+
+    apnewslivebot.save_sent()
+
+    commands = [name for name, _ in fake.log]
+    assert commands == ["delete", "sadd", "zadd", "zremrangebyrank", "exec"]
+    zadd_args = fake.log[2][1]
+    assert list(zadd_args[1]) == ["new"]
+    assert seen.pending() == {}
+
+
+def test_save_sent_keeps_ids_orjson_cannot_encode(monkeypatch, tmp_path):
+    path = tmp_path / "sent.json"
+    monkeypatch.setattr(apnewslivebot, "SENT_FILE", str(path))
+    monkeypatch.setattr(apnewslivebot, "redis_client", None)
+    monkeypatch.setattr(apnewslivebot, "sent_links", set())
+    monkeypatch.setattr(apnewslivebot, "sent_post_ids", apnewslivebot.SeenSet(["p1", "\ud83d x"]))
+
+    apnewslivebot.save_sent()
+
+    assert path.exists()
+    assert "\\ud83d x" in path.read_text(encoding="utf-8")
+
+
+def test_load_sent_reads_files_orjson_rejects(monkeypatch, tmp_path):
+    import json
+
+    path = tmp_path / "sent.json"
+    path.write_text(json.dumps({"links": [], "post_ids": ["p1", "\ud83d x"]}), encoding="utf-8")
+    monkeypatch.setattr(apnewslivebot, "SENT_FILE", str(path))
+    monkeypatch.setattr(apnewslivebot, "redis_client", None)
+    monkeypatch.setattr(apnewslivebot, "sent_post_ids", apnewslivebot.SeenSet())
+
+    apnewslivebot.load_sent()
+
+    assert list(apnewslivebot.sent_post_ids) == ["p1", "\ud83d x"]